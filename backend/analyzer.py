@@ -4,199 +4,439 @@ Implements rule-based threat detection on CSV log files.
 """
 
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 import logging
-from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple
+from datetime import datetime
+from typing import List, Dict, Any, Tuple, Iterator, Union, BinaryIO, Optional
 from collections import defaultdict
-import re
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the sweep below then runs as plain Python
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function uncompiled."""
+        def decorate(func):
+            return func
+        return decorate
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Format used for every alert and summary timestamp
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Columns every network log must provide
+REQUIRED_COLUMNS = ['timestamp', 'source_ip', 'destination_ip', 'port', 'protocol', 'packet_size']
+
+# A CSV log can be given as a file path or as an already open binary stream
+LogSource = Union[str, BinaryIO]
+
+@njit(cache=True)
+def _burst_starts(codes, timestamps, threshold, window):
+    """
+    Sweep rows sorted by (code, timestamp) and return, for every code with more
+    than threshold rows inside one window, the index of its first such window.
+    """
+    starts = []
+    n = len(timestamps)
+    left = 0
+    right = 0
+    while right < n:
+        if right == 0 or codes[right] != codes[right - 1]:
+            left = right
+        
+        while timestamps[right] - timestamps[left] > window:
+            left += 1
+        
+        if right - left + 1 > threshold:
+            starts.append(left)
+            # Only report once per code; skip to the next one
+            code = codes[right]
+            while right < n and codes[right] == code:
+                right += 1
+        else:
+            right += 1
+    
+    return np.array(starts, dtype=np.int64)
+
+# Human-readable alert descriptions, filled in from an alert's structured fields
+# only when the alert is shown rather than for every detection
+DESCRIPTION_TEMPLATES = {
+    'Suspicious Port': "Connection to non-standard port {port} detected from {source_ip}",
+    'High Frequency Connection': "IP {source_ip} made {connection_count} connections in 1 minute (threshold: {threshold})",
+    'Unusual Protocol': "Unusual protocol '{protocol}' detected from {source_ip}",
+    'Large Packet': "Large packet ({packet_size} bytes) detected from {source_ip} (threshold: {threshold})"
+}
+
+def describe_alert(alert: Dict[str, Any]) -> str:
+    """Return the human-readable description for an alert."""
+    if alert.get('description'):
+        return alert['description']
+    
+    template = DESCRIPTION_TEMPLATES.get(alert['threat_type'])
+    if template is None:
+        return alert['threat_type']
+    return template.format(**alert)
+
+class AlertSummary:
+    """Accumulates analysis summary statistics as batches of alerts are processed."""
+    
+    def __init__(self):
+        """Start an empty summary."""
+        self.total_alerts = 0
+        self.threat_counts = defaultdict(int)
+        self.source_ips = set()
+    
+    def update(self, alerts: List[Dict[str, Any]]) -> 'AlertSummary':
+        """Add a batch of alerts to the running totals."""
+        for alert in alerts:
+            self.threat_counts[alert['threat_type']] += 1
+            self.source_ips.add(alert['source_ip'])
+        self.total_alerts += len(alerts)
+        return self
+    
+    def to_dict(self, analysis_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """Return the summary in the shape used by the API, stamped with analysis_time (default: now)."""
+        if analysis_time is None:
+            analysis_time = datetime.now()
+        
+        return {
+            'total_alerts': self.total_alerts,
+            'unique_source_ips': len(self.source_ips),
+            'threat_breakdown': dict(self.threat_counts),
+            'analysis_timestamp': analysis_time.strftime(TIMESTAMP_FORMAT)
+        }
+
 class NetworkAnalyzer:
     """Analyzes network traffic logs and detects potential threats."""
     
+    # Rule lookup tables, built once and shared by every analyzer instance
+    ALLOWED_PORTS = frozenset({22, 80, 443})  # SSH, HTTP, HTTPS
+    COMMON_PROTOCOLS = frozenset({'TCP', 'UDP', 'HTTP', 'HTTPS'})
+    
     def __init__(self):
         """Initialize the network analyzer with detection rules."""
-        self.allowed_ports = {22, 80, 443}  # SSH, HTTP, HTTPS
+        self.allowed_ports = self.ALLOWED_PORTS
         self.connection_threshold = 10  # Max connections per minute
         self.time_window = 60  # Time window in seconds
+        self.common_protocols = self.COMMON_PROTOCOLS
+        # Column types for the Arrow CSV reader; low-cardinality strings are
+        # dictionary-encoded and arrive in pandas as categoricals
+        self.column_types = {
+            'source_ip': pa.dictionary(pa.int32(), pa.string()),
+            'destination_ip': pa.dictionary(pa.int32(), pa.string()),
+            'protocol': pa.dictionary(pa.int32(), pa.string()),
+            'port': pa.int32(),
+            'packet_size': pa.int64()
+        }
+        self.chunk_bytes = 64 * 1024 * 1024  # CSV bytes parsed per chunk when streaming
+    
+    @staticmethod
+    def _source_name(source: LogSource) -> str:
+        """Return a printable name for a log path or stream."""
+        if isinstance(source, str):
+            return source
+        return getattr(source, 'name', None) or 'uploaded stream'
+    
+    @staticmethod
+    def _check_columns(columns: List[str]):
+        """Raise ValueError if any required log column is missing."""
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+        
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+    
+    def _prepare_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Validate freshly read log rows and add the derived columns the detectors use."""
+        self._check_columns(list(df.columns))
+        
+        # Arrow parses ISO timestamps while reading; convert anything it left as text
+        if not pd.api.types.is_datetime64_any_dtype(df['timestamp']):
+            df['timestamp'] = pd.to_datetime(df['timestamp'])
         
-    def parse_csv_logs(self, csv_path: str) -> pd.DataFrame:
-        """Parse CSV log file and return a pandas DataFrame."""
+        # Empty cells arrive as NaT/NaN; alerts can't be stored without these fields
+        for col in ('timestamp', 'source_ip', 'port', 'packet_size'):
+            if df[col].isna().any():
+                raise ValueError(f"Column '{col}' has empty values")
+        
+        # Upper-case protocols once so detectors don't rebuild the column per call
+        df['protocol_upper'] = df['protocol'].map(str.upper, na_action='ignore').astype('category')
+        return df
+    
+    def parse_csv_logs(self, source: LogSource) -> pd.DataFrame:
+        """Parse a CSV log file path or binary stream and return a pandas DataFrame."""
+        source_name = self._source_name(source)
         try:
-            # Read CSV file
-            df = pd.read_csv(csv_path)
+            # Same reader and schema as iter_csv_chunks, with every chunk combined into one frame
+            df = self._prepare_frame(self._open_csv(source).read_all().to_pandas())
             
-            # Validate required columns
-            required_columns = ['timestamp', 'source_ip', 'destination_ip', 'port', 'protocol', 'packet_size']
-            missing_columns = [col for col in required_columns if col not in df.columns]
-            
-            if missing_columns:
-                raise ValueError(f"Missing required columns: {missing_columns}")
+            logger.info(f"Successfully parsed {len(df)} log entries from {source_name}")
+            return df
+        
+        except Exception as e:
+            logger.error(f"Error parsing CSV file {source_name}: {e}")
+            raise
+    
+    def _open_csv(self, source: LogSource) -> pa_csv.CSVStreamingReader:
+        """Open a CSV log with the log schema, reading roughly chunk_bytes per batch."""
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(block_size=self.chunk_bytes),
+            # Empty text cells become nulls, as pandas' own reader treats them
+            convert_options=pa_csv.ConvertOptions(column_types=self.column_types, strings_can_be_null=True)
+        )
+        self._check_columns(reader.schema.names)
+        return reader
+    
+    def iter_csv_chunks(self, source: LogSource) -> Iterator[pd.DataFrame]:
+        """Parse a CSV log path or binary stream in chunks of roughly chunk_bytes each."""
+        source_name = self._source_name(source)
+        try:
+            reader = self._open_csv(source)
             
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'])
+            total_rows = 0
+            for batch in reader:
+                df = self._prepare_frame(batch.to_pandas())
+                total_rows += len(df)
+                yield df
             
-            logger.info(f"Successfully parsed {len(df)} log entries from {csv_path}")
-            return df
+            logger.info(f"Successfully parsed {total_rows} log entries from {source_name}")
         
         except Exception as e:
-            logger.error(f"Error parsing CSV file {csv_path}: {e}")
+            logger.error(f"Error parsing CSV file {source_name}: {e}")
             raise
     
-    def detect_suspicious_ports(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Detect connections to non-standard ports."""
-        alerts = []
+    def _alert_columns(self, df: pd.DataFrame, mask: np.ndarray) -> Dict[str, np.ndarray]:
+        """Extract the fields alerts are built from for the rows selected by mask."""
+        rows = df.loc[mask]
+        return {
+            'timestamp': rows['timestamp'].dt.strftime(TIMESTAMP_FORMAT).to_numpy(),
+            'source_ip': rows['source_ip'].to_numpy(),
+            'port': rows['port'].to_numpy(dtype=np.int64),
+            'protocol': rows['protocol'].to_numpy(),
+            'packet_size': rows['packet_size'].to_numpy(dtype=np.int64)
+        }
+    
+    @staticmethod
+    def _select_columns(columns: Dict[str, np.ndarray], keep: np.ndarray) -> Dict[str, np.ndarray]:
+        """Narrow previously extracted alert columns down to the rows in keep."""
+        return {name: values[keep] for name, values in columns.items()}
+    
+    def _suspicious_port_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Return a boolean mask of connections to non-allowed ports."""
+        ports = df['port'].to_numpy()
         
-        # Filter for connections to non-allowed ports
-        suspicious_ports = df[~df['port'].isin(self.allowed_ports)]
+        # For a handful of ports, chained vectorized comparisons beat a hashed lookup
+        if len(self.allowed_ports) > 8:
+            return ~np.isin(ports, np.fromiter(self.allowed_ports, dtype=np.int64))
         
-        for _, row in suspicious_ports.iterrows():
-            alert = {
-                'timestamp': row['timestamp'].strftime("%Y-%m-%d %H:%M:%S"),
-                'source_ip': row['source_ip'],
-                'port': int(row['port']),
-                'threat_type': 'Suspicious Port',
-                'description': f"Connection to non-standard port {row['port']} detected from {row['source_ip']}"
+        mask = np.ones(len(ports), dtype=bool)
+        for port in self.allowed_ports:
+            mask &= ports != port
+        return mask
+    
+    def _suspicious_port_alerts(self, columns: Dict[str, np.ndarray]) -> Iterator[Dict[str, Any]]:
+        """Build suspicious port alerts from extracted alert columns."""
+        return (
+            {
+                'timestamp': timestamp,
+                'source_ip': source_ip,
+                'port': int(port),
+                'threat_type': 'Suspicious Port'
             }
-            alerts.append(alert)
+            for timestamp, source_ip, port in zip(columns['timestamp'], columns['source_ip'], columns['port'])
+        )
+    
+    def detect_suspicious_ports(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Detect connections to non-standard ports."""
+        columns = self._alert_columns(df, self._suspicious_port_mask(df))
+        alerts = list(self._suspicious_port_alerts(columns))
         
         logger.info(f"Detected {len(alerts)} suspicious port connections")
         return alerts
     
-    def detect_high_frequency_connections(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Detect IPs with high frequency connections (>10 per minute)."""
+    def _frequency_columns(self, df: pd.DataFrame,
+                           ip_codes: Dict[Any, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Extract integer source IP codes, int64 nanosecond timestamps and ports for rows with a source IP.
+        
+        Codes come from ip_codes, which is extended with any IP not seen before so that
+        codes stay consistent across chunks.
+        """
+        codes, source_ips = pd.factorize(df['source_ip'])
+        has_ip = codes >= 0
+        
+        # Map this frame's codes onto the shared ones, one lookup per distinct IP
+        shared_codes = np.array([ip_codes.setdefault(ip, len(ip_codes)) for ip in source_ips], dtype=np.int64)
+        codes = shared_codes[codes[has_ip]]
+        timestamps = df['timestamp'].to_numpy(dtype='datetime64[ns]').view(np.int64)[has_ip]
+        ports = df['port'].to_numpy(dtype=np.int64)[has_ip]
+        return codes, timestamps, ports
+    
+    def _high_frequency_alerts(self, codes: np.ndarray, timestamps: np.ndarray, ports: np.ndarray,
+                               source_ips: List[Any]) -> List[Dict[str, Any]]:
+        """Build high frequency alerts from columns produced by _frequency_columns."""
         alerts = []
         
-        # Group by source IP and time windows
-        df_sorted = df.sort_values('timestamp')
+        window = self.time_window * 10**9  # nanoseconds
         
-        # Create time windows of 1 minute
-        for source_ip in df['source_ip'].unique():
-            ip_data = df_sorted[df_sorted['source_ip'] == source_ip].copy()
-            
-            if len(ip_data) < self.connection_threshold:
-                continue
+        # Sort by (source IP, timestamp) so every IP is one contiguous, time-ordered run
+        order = np.lexsort((timestamps, codes))
+        codes = codes[order]
+        timestamps = timestamps[order]
+        ports = ports[order]
+        
+        starts = _burst_starts(codes, timestamps, self.connection_threshold, window)
+        start_times = pd.to_datetime(timestamps[starts], unit='ns').strftime(TIMESTAMP_FORMAT)
+        
+        for left, start_time in zip(starts, start_times):
+            code = codes[left]
+            ip_end = np.searchsorted(codes, code, side='right')
             
-            # Check for high frequency in any 1-minute window
-            for i in range(len(ip_data)):
-                start_time = ip_data.iloc[i]['timestamp']
-                end_time = start_time + timedelta(seconds=self.time_window)
-                
-                # Count connections in this time window
-                window_connections = ip_data[
-                    (ip_data['timestamp'] >= start_time) & 
-                    (ip_data['timestamp'] <= end_time)
-                ]
-                
-                if len(window_connections) > self.connection_threshold:
-                    alert = {
-                        'timestamp': start_time.strftime("%Y-%m-%d %H:%M:%S"),
-                        'source_ip': source_ip,
-                        'port': int(window_connections.iloc[0]['port']),
-                        'threat_type': 'High Frequency Connection',
-                        'description': f"IP {source_ip} made {len(window_connections)} connections in 1 minute (threshold: {self.connection_threshold})"
-                    }
-                    alerts.append(alert)
-                    break  # Only report once per IP to avoid spam
+            # Count every connection in the minute starting at the window's first connection
+            window_end = np.searchsorted(timestamps[left:ip_end], timestamps[left] + window, side='right')
+            alert = {
+                'timestamp': start_time,
+                'source_ip': source_ips[code],
+                'port': int(ports[left]),
+                'threat_type': 'High Frequency Connection',
+                'connection_count': int(window_end),
+                'threshold': self.connection_threshold
+            }
+            alerts.append(alert)
         
         logger.info(f"Detected {len(alerts)} high frequency connection patterns")
         return alerts
     
-    def detect_unusual_protocols(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
-        """Detect unusual or potentially malicious protocols."""
-        alerts = []
-        common_protocols = ['TCP', 'UDP', 'HTTP', 'HTTPS']
-        
-        # Find entries with unusual protocols
-        unusual_protocols = df[~df['protocol'].str.upper().isin(common_protocols)]
-        
-        for _, row in unusual_protocols.iterrows():
-            alert = {
-                'timestamp': row['timestamp'].strftime("%Y-%m-%d %H:%M:%S"),
-                'source_ip': row['source_ip'],
-                'port': int(row['port']),
+    def detect_high_frequency_connections(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Detect IPs with high frequency connections (>10 per minute)."""
+        ip_codes = {}
+        codes, timestamps, ports = self._frequency_columns(df, ip_codes)
+        return self._high_frequency_alerts(codes, timestamps, ports, list(ip_codes))
+    
+    def _unusual_protocol_mask(self, df: pd.DataFrame) -> np.ndarray:
+        """Return a boolean mask of connections using uncommon protocols."""
+        if 'protocol_upper' in df.columns:
+            protocols = df['protocol_upper']
+        else:
+            protocols = df['protocol'].str.upper()
+        return ~protocols.isin(self.common_protocols).to_numpy(dtype=bool)
+    
+    def _unusual_protocol_alerts(self, columns: Dict[str, np.ndarray]) -> Iterator[Dict[str, Any]]:
+        """Build unusual protocol alerts from extracted alert columns."""
+        return (
+            {
+                'timestamp': timestamp,
+                'source_ip': source_ip,
+                'port': int(port),
                 'threat_type': 'Unusual Protocol',
-                'description': f"Unusual protocol '{row['protocol']}' detected from {row['source_ip']}"
+                'protocol': protocol
             }
-            alerts.append(alert)
+            for timestamp, source_ip, port, protocol in zip(
+                columns['timestamp'], columns['source_ip'], columns['port'], columns['protocol']
+            )
+        )
+    
+    def detect_unusual_protocols(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Detect unusual or potentially malicious protocols."""
+        columns = self._alert_columns(df, self._unusual_protocol_mask(df))
+        alerts = list(self._unusual_protocol_alerts(columns))
         
         logger.info(f"Detected {len(alerts)} unusual protocol connections")
         return alerts
     
-    def detect_large_packets(self, df: pd.DataFrame, size_threshold: int = 65536) -> List[Dict[str, Any]]:
-        """Detect unusually large packets that might indicate data exfiltration."""
-        alerts = []
-        
-        # Filter for large packets
-        large_packets = df[df['packet_size'] > size_threshold]
-        
-        for _, row in large_packets.iterrows():
-            alert = {
-                'timestamp': row['timestamp'].strftime("%Y-%m-%d %H:%M:%S"),
-                'source_ip': row['source_ip'],
-                'port': int(row['port']),
+    def _large_packet_mask(self, df: pd.DataFrame, size_threshold: int) -> np.ndarray:
+        """Return a boolean mask of packets larger than size_threshold."""
+        return (df['packet_size'] > size_threshold).to_numpy(dtype=bool)
+    
+    def _large_packet_alerts(self, columns: Dict[str, np.ndarray], size_threshold: int) -> Iterator[Dict[str, Any]]:
+        """Build large packet alerts from extracted alert columns."""
+        return (
+            {
+                'timestamp': timestamp,
+                'source_ip': source_ip,
+                'port': int(port),
                 'threat_type': 'Large Packet',
-                'description': f"Large packet ({row['packet_size']} bytes) detected from {row['source_ip']} (threshold: {size_threshold})"
+                'packet_size': int(packet_size),
+                'threshold': size_threshold
             }
-            alerts.append(alert)
+            for timestamp, source_ip, port, packet_size in zip(
+                columns['timestamp'], columns['source_ip'], columns['port'], columns['packet_size']
+            )
+        )
+    
+    def detect_large_packets(self, df: pd.DataFrame, size_threshold: int = 65536) -> List[Dict[str, Any]]:
+        """Detect unusually large packets that might indicate data exfiltration."""
+        columns = self._alert_columns(df, self._large_packet_mask(df, size_threshold))
+        alerts = list(self._large_packet_alerts(columns, size_threshold))
         
         logger.info(f"Detected {len(alerts)} large packet transmissions")
         return alerts
     
-    def analyze_logs(self, csv_path: str) -> List[Dict[str, Any]]:
-        """Perform comprehensive analysis on network logs and return all detected threats."""
+    def _iter_row_alerts(self, df: pd.DataFrame, size_threshold: int = 65536) -> Iterator[Dict[str, Any]]:
+        """Run the rules that judge each connection on its own and yield their alerts."""
+        port_mask = self._suspicious_port_mask(df)
+        protocol_mask = self._unusual_protocol_mask(df)
+        size_mask = self._large_packet_mask(df, size_threshold)
+        
+        # Format timestamps and pull columns once for every row any rule flagged
+        flagged = port_mask | protocol_mask | size_mask
+        columns = self._alert_columns(df, flagged)
+        
+        # Detect suspicious ports
+        logger.info(f"Detected {int(port_mask.sum())} suspicious port connections")
+        yield from self._suspicious_port_alerts(self._select_columns(columns, port_mask[flagged]))
+        
+        # Detect unusual protocols
+        logger.info(f"Detected {int(protocol_mask.sum())} unusual protocol connections")
+        yield from self._unusual_protocol_alerts(self._select_columns(columns, protocol_mask[flagged]))
+        
+        # Detect large packets
+        logger.info(f"Detected {int(size_mask.sum())} large packet transmissions")
+        yield from self._large_packet_alerts(self._select_columns(columns, size_mask[flagged]), size_threshold)
+    
+    def iter_alerts(self, df: pd.DataFrame, size_threshold: int = 65536) -> Iterator[Dict[str, Any]]:
+        """Run every detection rule and yield alerts one at a time."""
+        yield from self._iter_row_alerts(df, size_threshold)
+        
+        # Detect high frequency connections
+        yield from self.detect_high_frequency_connections(df)
+    
+    def iter_log_alerts(self, source: LogSource) -> Iterator[Dict[str, Any]]:
+        """Parse network logs chunk by chunk and lazily yield every detected threat."""
         try:
-            # Parse the CSV file
-            df = self.parse_csv_logs(csv_path)
-            
-            all_alerts = []
-            
-            # Run all detection rules
             logger.info("Running threat detection analysis...")
             
-            # Detect suspicious ports
-            port_alerts = self.detect_suspicious_ports(df)
-            all_alerts.extend(port_alerts)
+            # Row-level rules finish with each chunk. The frequency rule needs every connection
+            # of an IP, so only its compact integer columns are kept until the end.
+            ip_codes = {}
+            frequency_parts = []
+            for df in self.iter_csv_chunks(source):
+                yield from self._iter_row_alerts(df)
+                frequency_parts.append(self._frequency_columns(df, ip_codes))
             
             # Detect high frequency connections
-            freq_alerts = self.detect_high_frequency_connections(df)
-            all_alerts.extend(freq_alerts)
-            
-            # Detect unusual protocols
-            protocol_alerts = self.detect_unusual_protocols(df)
-            all_alerts.extend(protocol_alerts)
-            
-            # Detect large packets
-            packet_alerts = self.detect_large_packets(df)
-            all_alerts.extend(packet_alerts)
-            
-            logger.info(f"Analysis complete. Total alerts generated: {len(all_alerts)}")
-            return all_alerts
+            if frequency_parts:
+                codes, timestamps, ports = (np.concatenate(part) for part in zip(*frequency_parts))
+                yield from self._high_frequency_alerts(codes, timestamps, ports, list(ip_codes))
         
         except Exception as e:
             logger.error(f"Error during log analysis: {e}")
             raise
     
+    def analyze_logs(self, source: LogSource) -> List[Dict[str, Any]]:
+        """Perform comprehensive analysis on network logs and return all detected threats."""
+        all_alerts = list(self.iter_log_alerts(source))
+        
+        logger.info(f"Analysis complete. Total alerts generated: {len(all_alerts)}")
+        return all_alerts
+    
     def get_analysis_summary(self, alerts: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate a summary of the analysis results."""
-        threat_counts = defaultdict(int)
-        source_ips = set()
-        
-        for alert in alerts:
-            threat_counts[alert['threat_type']] += 1
-            source_ips.add(alert['source_ip'])
-        
-        summary = {
-            'total_alerts': len(alerts),
-            'unique_source_ips': len(source_ips),
-            'threat_breakdown': dict(threat_counts),
-            'analysis_timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        return summary
+        return AlertSummary().update(alerts).to_dict()
 
 if __name__ == "__main__":
     # Test the analyzer
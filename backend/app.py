@@ -3,16 +3,20 @@ Flask backend application for the Intrusion Detection Dashboard.
 Provides REST API endpoints for alert management and log analysis.
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, send_from_directory
 from flask_cors import CORS
 import os
 import logging
+import hashlib
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-import tempfile
+import orjson
+from itertools import islice
 import pandas as pd
 
 from database import DatabaseManager
-from analyzer import NetworkAnalyzer
+from analyzer import NetworkAnalyzer, AlertSummary, describe_alert, TIMESTAMP_FORMAT
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +28,42 @@ app = Flask(__name__)
 # Configure CORS with security headers
 CORS(app, origins=['http://localhost:3000', 'http://127.0.0.1:3000'])
 
+def json_response(obj, status: int = 200) -> Response:
+    """Serialize obj with orjson and wrap it in a JSON response."""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+def file_digest(stream) -> str:
+    """Return the SHA-256 hex digest of a binary stream, leaving it rewound to the start."""
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for block in iter(lambda: stream.read(1 << 20), b''):
+        digest.update(block)
+    stream.seek(0)
+    return digest.hexdigest()
+
+# One lock per file digest currently being uploaded, dropped once nobody holds it
+_digest_locks = {}
+_digest_locks_guard = threading.Lock()
+
+@contextmanager
+def digest_lock(digest: str):
+    """Hold the lock for one file digest for the duration of the block."""
+    with _digest_locks_guard:
+        lock, holders = _digest_locks.get(digest, (None, 0))
+        if lock is None:
+            lock = threading.Lock()
+        _digest_locks[digest] = (lock, holders + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _digest_locks_guard:
+            lock, holders = _digest_locks[digest]
+            if holders == 1:
+                del _digest_locks[digest]
+            else:
+                _digest_locks[digest] = (lock, holders - 1)
+
 # Add security headers
 @app.after_request
 def add_security_headers(response):
@@ -47,6 +87,13 @@ def add_security_headers(response):
     
     return response
 
+# Number of alerts written to the database per transaction during analysis
+ALERT_BATCH_SIZE = 10000
+
+# Page sizes for GET /api/alerts
+DEFAULT_ALERTS_LIMIT = 500
+MAX_ALERTS_LIMIT = 10000
+
 # Initialize database and analyzer
 db_manager = DatabaseManager()
 network_analyzer = NetworkAnalyzer()
@@ -54,43 +101,82 @@ network_analyzer = NetworkAnalyzer()
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint to verify the API is running."""
-    return jsonify({
+    return json_response({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': datetime.now(),
         'service': 'Intrusion Detection Dashboard API'
     })
 
 @app.route('/api/alerts', methods=['GET'])
 def get_alerts():
     """
-    GET endpoint to retrieve all alerts from the database.
+    GET endpoint to retrieve alerts from the database, newest first.
     
     Query parameters:
     - recent: if true, returns only alerts from last 24 hours
+    - limit: maximum number of alerts to return (default 500, capped at 10000)
+    - before: only return alerts with an id below this cursor (use next_cursor from the previous page)
+    
+    `count` is the size of this page; `total` and `threat_breakdown` cover every matching alert.
     """
     try:
         recent_only = request.args.get('recent', 'false').lower() == 'true'
         
+        try:
+            limit = int(request.args.get('limit', DEFAULT_ALERTS_LIMIT))
+            before = request.args.get('before')
+            before = int(before) if before is not None else None
+        except ValueError:
+            return json_response({
+                'success': False,
+                'error': 'limit and before must be integers'
+            }, 400)
+        
+        limit = min(max(limit, 1), MAX_ALERTS_LIMIT)
+        
+        # The newest id and the row count together change on every insert and delete,
+        # so they identify the table's contents; let polling clients skip unchanged pages
+        etag = None
+        version = None if recent_only else db_manager.get_alerts_version()
+        if version is not None:
+            etag = f"alerts-{version[0]}-{version[1]}"
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+        
         if recent_only:
-            alerts = db_manager.get_recent_alerts(24)
+            alerts = db_manager.get_recent_alerts(24, limit=limit, before=before)
+            threat_breakdown = db_manager.get_threat_counts(24)
         else:
-            alerts = db_manager.get_all_alerts()
+            alerts = db_manager.get_all_alerts(limit=limit, before=before)
+            threat_breakdown = db_manager.get_threat_counts()
+        
+        # Descriptions are rendered from structured fields only for alerts being returned
+        for alert in alerts:
+            alert['description'] = describe_alert(alert)
         
         logger.info(f"Retrieved {len(alerts)} alerts (recent_only={recent_only})")
         
-        return jsonify({
+        response = json_response({
             'success': True,
             'alerts': alerts,
             'count': len(alerts),
-            'timestamp': datetime.now().isoformat()
+            'total': sum(threat_breakdown.values()),
+            'threat_breakdown': threat_breakdown,
+            'next_cursor': alerts[-1]['id'] if len(alerts) == limit else None,
+            'timestamp': datetime.now()
         })
+        if etag is not None:
+            response.set_etag(etag)
+        return response
     
     except Exception as e:
         logger.error(f"Error retrieving alerts: {e}")
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/alerts/stats', methods=['GET'])
 def get_alert_stats():
@@ -99,35 +185,29 @@ def get_alert_stats():
         # Get hourly alert counts for the last 24 hours
         hourly_data = db_manager.get_alert_count_by_hour(24)
         
-        # Get recent alerts for threat type breakdown
-        recent_alerts = db_manager.get_recent_alerts(24)
-        
-        # Calculate threat type breakdown
-        threat_breakdown = {}
-        for alert in recent_alerts:
-            threat_type = alert['threat_type']
-            threat_breakdown[threat_type] = threat_breakdown.get(threat_type, 0) + 1
+        # Count recent alerts per threat type in the database
+        threat_breakdown = db_manager.get_threat_counts(24)
         
         stats = {
             'hourly_counts': hourly_data,
             'threat_breakdown': threat_breakdown,
-            'total_recent_alerts': len(recent_alerts),
-            'timestamp': datetime.now().isoformat()
+            'total_recent_alerts': sum(threat_breakdown.values()),
+            'timestamp': datetime.now()
         }
         
         logger.info(f"Generated alert statistics: {len(hourly_data)} hourly entries, {len(threat_breakdown)} threat types")
         
-        return jsonify({
+        return json_response({
             'success': True,
             'stats': stats
         })
     
     except Exception as e:
         logger.error(f"Error generating alert statistics: {e}")
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze_logs():
@@ -139,72 +219,87 @@ def analyze_logs():
     try:
         # Check if file was uploaded
         if 'file' not in request.files:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'No file uploaded'
-            }), 400
+            }, 400)
         
         file = request.files['file']
         
         if file.filename == '':
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'No file selected'
-            }), 400
+            }, 400)
         
         if not file.filename.endswith('.csv'):
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'File must be a CSV file'
-            }), 400
+            }, 400)
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False) as temp_file:
-            file.save(temp_file.name)
-            temp_file_path = temp_file.name
+        analysis_time = datetime.now()
         
-        try:
-            # Analyze the uploaded file
+        # Uploads of the same file wait for each other, so the cache check, cleanup,
+        # storage and marking below always see one analysis of the file at a time
+        source_digest = file_digest(file.stream)
+        with digest_lock(source_digest):
+            # A file whose alerts are already stored is answered from the database
+            cached_summary = db_manager.get_digest_summary(source_digest)
+            if cached_summary is not None:
+                logger.info(f"Skipping analysis of {file.filename}: alerts for this file are already stored")
+                cached_summary['analysis_timestamp'] = analysis_time.strftime(TIMESTAMP_FORMAT)
+                return json_response({
+                    'success': True,
+                    'cached': True,
+                    'alerts_generated': cached_summary['total_alerts'],
+                    'alerts_stored': 0,
+                    'summary': cached_summary,
+                    'timestamp': analysis_time
+                })
+            
+            # Drop alerts left behind by an earlier upload of this file that did not finish
+            db_manager.delete_alerts_by_digest(source_digest)
+            
+            # Analyze the upload straight from the request stream; no temporary file needed
             logger.info(f"Starting analysis of uploaded file: {file.filename}")
-            alerts = network_analyzer.analyze_logs(temp_file_path)
+            alerts = network_analyzer.iter_log_alerts(file.stream)
             
-            # Store alerts in database
+            # Store alerts in database batch by batch, summarizing as we go
+            summary = AlertSummary()
             stored_count = 0
-            for alert in alerts:
-                success = db_manager.insert_alert(
-                    alert['timestamp'],
-                    alert['source_ip'],
-                    alert['port'],
-                    alert['threat_type'],
-                    alert['description']
-                )
-                if success:
-                    stored_count += 1
+            try:
+                while True:
+                    batch = list(islice(alerts, ALERT_BATCH_SIZE))
+                    if not batch:
+                        break
+                    summary.update(batch)
+                    stored_count += db_manager.insert_alerts(batch, source_digest)
+            except Exception:
+                # Batches are committed as they go; don't keep a partial analysis of this file
+                db_manager.delete_alerts_by_digest(source_digest)
+                raise
             
-            # Generate analysis summary
-            summary = network_analyzer.get_analysis_summary(alerts)
+            # Only a completely stored analysis may answer later uploads of the same file
+            db_manager.mark_digest_analyzed(source_digest)
             
-            logger.info(f"Analysis complete: {len(alerts)} alerts generated, {stored_count} stored in database")
+            logger.info(f"Analysis complete: {summary.total_alerts} alerts generated, {stored_count} stored in database")
             
-            return jsonify({
+            return json_response({
                 'success': True,
-                'alerts_generated': len(alerts),
+                'cached': False,
+                'alerts_generated': summary.total_alerts,
                 'alerts_stored': stored_count,
-                'summary': summary,
-                'timestamp': datetime.now().isoformat()
+                'summary': summary.to_dict(analysis_time),
+                'timestamp': analysis_time
             })
         
-        finally:
-            # Clean up temporary file
-            if os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
-    
     except Exception as e:
         logger.error(f"Error analyzing logs: {e}")
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/sample-log', methods=['GET'])
 def download_sample_log():
@@ -218,10 +313,10 @@ def download_sample_log():
         )
     except Exception as e:
         logger.error(f"Error serving sample log file: {e}")
-        return jsonify({
+        return json_response({
             'success': False,
             'error': 'Sample log file not found'
-        }), 404
+        }, 404)
 
 @app.route('/api/alerts', methods=['DELETE'])
 def clear_alerts():
@@ -231,39 +326,39 @@ def clear_alerts():
         
         if success:
             logger.info("All alerts cleared from database")
-            return jsonify({
+            return json_response({
                 'success': True,
                 'message': 'All alerts cleared successfully'
             })
         else:
-            return jsonify({
+            return json_response({
                 'success': False,
                 'error': 'Failed to clear alerts'
-            }), 500
+            }, 500)
     
     except Exception as e:
         logger.error(f"Error clearing alerts: {e}")
-        return jsonify({
+        return json_response({
             'success': False,
             'error': str(e)
-        }), 500
+        }, 500)
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
-    return jsonify({
+    return json_response({
         'success': False,
         'error': 'Endpoint not found'
-    }), 404
+    }, 404)
 
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors."""
     logger.error(f"Internal server error: {error}")
-    return jsonify({
+    return json_response({
         'success': False,
         'error': 'Internal server error'
-    }), 500
+    }, 500)
 
 if __name__ == '__main__':
     logger.info("Starting Intrusion Detection Dashboard API...")
@@ -5,36 +5,90 @@ Handles alert storage and retrieval operations.
 
 import sqlite3
 import logging
-from datetime import datetime
-from typing import List, Dict, Any
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Iterator, Tuple
 import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Alerts keep structured detection fields; description is only stored for
+# alerts that were inserted with a ready-made message
+ALERTS_COLUMNS = '''
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    source_ip TEXT NOT NULL,
+    port INTEGER NOT NULL,
+    threat_type TEXT NOT NULL,
+    description TEXT,
+    protocol TEXT,
+    packet_size INTEGER,
+    connection_count INTEGER,
+    threshold INTEGER,
+    source_digest TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+'''
+
 class DatabaseManager:
     """Manages SQLite database operations for alerts."""
     
-    def __init__(self, db_path: str = "alerts.db"):
+    def __init__(self, db_path: str = "alerts.db", max_idle_connections: int = 4):
         """Initialize database manager with specified database path."""
         self.db_path = db_path
+        # Flask's dev server runs every request on a fresh thread, so connections are pooled
+        # across threads rather than kept per thread; each is used by one thread at a time
+        self.max_idle_connections = max_idle_connections
+        self._idle_connections: List[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
         self.init_database()
     
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a new database connection with the pragmas every connection uses."""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL keeps readers unblocked during bulk inserts; NORMAL sync is safe with WAL
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA mmap_size=268435456')
+        return conn
+    
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection for one transaction, opening a new one if none is idle."""
+        with self._pool_lock:
+            conn = self._idle_connections.pop() if self._idle_connections else None
+        if conn is None:
+            conn = self._open_connection()
+        
+        try:
+            with conn:
+                yield conn
+        finally:
+            with self._pool_lock:
+                if len(self._idle_connections) < self.max_idle_connections:
+                    self._idle_connections.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+    
     def init_database(self):
         """Initialize the SQLite database and create alerts table if it doesn't exist."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute(f'CREATE TABLE IF NOT EXISTS alerts ({ALERTS_COLUMNS})')
+                self._migrate_alerts_table(cursor)
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_created_at ON alerts(created_at DESC)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_threat_type ON alerts(threat_type)')
+                cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_source_digest ON alerts(source_digest)')
+                # Uploads whose analysis finished and whose alerts were all stored
                 cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS alerts (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp TEXT NOT NULL,
-                        source_ip TEXT NOT NULL,
-                        port INTEGER NOT NULL,
-                        threat_type TEXT NOT NULL,
-                        description TEXT NOT NULL,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    CREATE TABLE IF NOT EXISTS analyzed_uploads (
+                        source_digest TEXT PRIMARY KEY,
+                        analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                     )
                 ''')
                 conn.commit()
@@ -43,11 +97,41 @@ class DatabaseManager:
             logger.error(f"Database initialization error: {e}")
             raise
     
+    def _migrate_alerts_table(self, cursor: sqlite3.Cursor):
+        """Bring an alerts table created by an older version up to the current columns."""
+        columns = {row['name'] for row in cursor.execute('PRAGMA table_info(alerts)')}
+        if 'threshold' in columns:
+            if 'source_digest' not in columns:
+                cursor.execute('ALTER TABLE alerts ADD COLUMN source_digest TEXT')
+            return
+        
+        # SQLite cannot relax NOT NULL on description in place, so copy into a fresh table
+        cursor.execute('ALTER TABLE alerts RENAME TO alerts_legacy')
+        cursor.execute(f'CREATE TABLE alerts ({ALERTS_COLUMNS})')
+        cursor.execute('''
+            INSERT INTO alerts (id, timestamp, source_ip, port, threat_type, description, created_at)
+            SELECT id, timestamp, source_ip, port, threat_type, description, created_at
+            FROM alerts_legacy
+        ''')
+        cursor.execute('DROP TABLE alerts_legacy')
+        logger.info("Migrated alerts table to structured alert fields")
+    
+    @staticmethod
+    def _cutoff(hours: int) -> str:
+        """Return the UTC cutoff for the last `hours` hours in the same format as CURRENT_TIMESTAMP."""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
+        return cutoff.strftime("%Y-%m-%d %H:%M:%S")
+    
+    @staticmethod
+    def _limit(limit: Optional[int]) -> int:
+        """Translate an optional row limit into SQLite's LIMIT value, where -1 means no limit."""
+        return -1 if limit is None else limit
+    
     def insert_alert(self, timestamp: str, source_ip: str, port: int, 
                     threat_type: str, description: str) -> bool:
         """Insert a new alert into the database."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO alerts (timestamp, source_ip, port, threat_type, description)
@@ -60,19 +144,153 @@ class DatabaseManager:
             logger.error(f"Error inserting alert: {e}")
             return False
     
-    def get_all_alerts(self) -> List[Dict[str, Any]]:
-        """Retrieve all alerts from the database."""
+    def insert_alerts(self, alerts: List[Dict[str, Any]], source_digest: Optional[str] = None) -> int:
+        """
+        Insert a batch of alerts in a single transaction and return the number stored.
+        
+        source_digest records which uploaded file the alerts were detected in. Unlike the
+        single-alert methods, a failed batch raises sqlite3.Error so the caller can't
+        mistake a dropped batch for a stored one.
+        """
+        if not alerts:
+            return 0
+        
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany('''
+                    INSERT INTO alerts (timestamp, source_ip, port, threat_type, description,
+                                        protocol, packet_size, connection_count, threshold, source_digest)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', [
+                    (alert['timestamp'], alert['source_ip'], alert['port'], alert['threat_type'],
+                     alert.get('description'), alert.get('protocol'), alert.get('packet_size'),
+                     alert.get('connection_count'), alert.get('threshold'), source_digest)
+                    for alert in alerts
+                ])
+                conn.commit()
+                logger.info(f"Inserted {len(alerts)} alerts")
+                return len(alerts)
+        except sqlite3.Error as e:
+            logger.error(f"Error inserting alerts: {e}")
+            raise
+    
+    def get_alerts_version(self) -> Optional[Tuple[int, int]]:
+        """
+        Return (newest alert id, alert count), which changes whenever alerts are stored or deleted.
+        
+        Ids come from AUTOINCREMENT and are never reused, so any insert raises the newest
+        id and a delete on its own lowers the count.
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('SELECT COALESCE(MAX(id), 0), COUNT(*) FROM alerts')
+                newest_id, count = cursor.fetchone()
+                return newest_id, count
+        except sqlite3.Error as e:
+            logger.error(f"Error retrieving alerts version: {e}")
+            return None
+    
+    def mark_digest_analyzed(self, source_digest: str) -> bool:
+        """Record that every alert of the file with this digest has been stored."""
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'INSERT OR REPLACE INTO analyzed_uploads (source_digest) VALUES (?)',
+                    (source_digest,)
+                )
+                conn.commit()
+                return True
+        except sqlite3.Error as e:
+            logger.error(f"Error recording analysis of {source_digest}: {e}")
+            return False
+    
+    def delete_alerts_by_digest(self, source_digest: str) -> int:
+        """Delete the alerts stored for the file with this digest and return how many were removed."""
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM analyzed_uploads WHERE source_digest = ?', (source_digest,))
+                cursor.execute('DELETE FROM alerts WHERE source_digest = ?', (source_digest,))
+                conn.commit()
+                if cursor.rowcount:
+                    logger.info(f"Deleted {cursor.rowcount} alerts stored for {source_digest}")
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Error deleting alerts for {source_digest}: {e}")
+            return 0
+    
+    def get_digest_summary(self, source_digest: str) -> Optional[Dict[str, Any]]:
+        """Summarize the stored alerts of a fully analyzed file, or return None if it was not analyzed."""
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(
+                    'SELECT 1 FROM analyzed_uploads WHERE source_digest = ?', (source_digest,)
+                )
+                if cursor.fetchone() is None:
+                    return None
+                
+                cursor.execute('''
+                    SELECT threat_type, COUNT(*) AS count
+                    FROM alerts
+                    WHERE source_digest = ?
+                    GROUP BY threat_type
+                ''', (source_digest,))
+                threat_breakdown = {row['threat_type']: row['count'] for row in cursor.fetchall()}
+                
+                cursor.execute('''
+                    SELECT COUNT(DISTINCT source_ip) FROM alerts WHERE source_digest = ?
+                ''', (source_digest,))
+                unique_source_ips = cursor.fetchone()[0]
+                
+                return {
+                    'total_alerts': sum(threat_breakdown.values()),
+                    'unique_source_ips': unique_source_ips,
+                    'threat_breakdown': threat_breakdown
+                }
+        except sqlite3.Error as e:
+            logger.error(f"Error summarizing alerts for {source_digest}: {e}")
+            return None
+    
+    def get_threat_counts(self, hours: Optional[int] = None) -> Dict[str, int]:
+        """Count stored alerts per threat type, only those from the last `hours` hours when given."""
+        cutoff = None if hours is None else self._cutoff(hours)
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    SELECT id, timestamp, source_ip, port, threat_type, description, created_at
+                    SELECT threat_type, COUNT(*) AS count
+                    FROM alerts
+                    WHERE (? IS NULL OR created_at >= ?)
+                    GROUP BY threat_type
+                ''', (cutoff, cutoff))
+                return {row['threat_type']: row['count'] for row in cursor.fetchall()}
+        except sqlite3.Error as e:
+            logger.error(f"Error counting alerts by threat type: {e}")
+            return {}
+    
+    def get_all_alerts(self, limit: Optional[int] = None, before: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve alerts from the database, newest first.
+        
+        At most `limit` alerts are returned (all if None), starting below alert id `before` when given.
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT id, timestamp, source_ip, port, threat_type, description,
+                           protocol, packet_size, connection_count, threshold, created_at
                     FROM alerts 
-                    ORDER BY created_at DESC
-                ''')
+                    WHERE (? IS NULL OR id < ?)
+                    ORDER BY id DESC
+                    LIMIT ?
+                ''', (before, before, self._limit(limit)))
                 
-                columns = [description[0] for description in cursor.description]
-                alerts = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                alerts = [dict(row) for row in cursor.fetchall()]
                 
                 logger.info(f"Retrieved {len(alerts)} alerts from database")
                 return alerts
@@ -80,20 +298,22 @@ class DatabaseManager:
             logger.error(f"Error retrieving alerts: {e}")
             return []
     
-    def get_recent_alerts(self, hours: int = 24) -> List[Dict[str, Any]]:
-        """Retrieve alerts from the last specified hours."""
+    def get_recent_alerts(self, hours: int = 24, limit: Optional[int] = None,
+                          before: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Retrieve alerts from the last specified hours, paginated like get_all_alerts."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
-                    SELECT id, timestamp, source_ip, port, threat_type, description, created_at
+                    SELECT id, timestamp, source_ip, port, threat_type, description,
+                           protocol, packet_size, connection_count, threshold, created_at
                     FROM alerts 
-                    WHERE datetime(created_at) >= datetime('now', '-{} hours')
-                    ORDER BY created_at DESC
-                '''.format(hours))
+                    WHERE created_at >= ? AND (? IS NULL OR id < ?)
+                    ORDER BY id DESC
+                    LIMIT ?
+                ''', (self._cutoff(hours), before, before, self._limit(limit)))
                 
-                columns = [description[0] for description in cursor.description]
-                alerts = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                alerts = [dict(row) for row in cursor.fetchall()]
                 
                 logger.info(f"Retrieved {len(alerts)} recent alerts from database")
                 return alerts
@@ -104,9 +324,10 @@ class DatabaseManager:
     def clear_alerts(self) -> bool:
         """Clear all alerts from the database (for testing purposes)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('DELETE FROM alerts')
+                cursor.execute('DELETE FROM analyzed_uploads')
                 conn.commit()
                 logger.info("All alerts cleared from database")
                 return True
@@ -117,20 +338,19 @@ class DatabaseManager:
     def get_alert_count_by_hour(self, hours: int = 24) -> List[Dict[str, Any]]:
         """Get alert counts grouped by hour for the last specified hours."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     SELECT 
                         strftime('%Y-%m-%d %H:00:00', created_at) as hour,
                         COUNT(*) as count
                     FROM alerts 
-                    WHERE datetime(created_at) >= datetime('now', '-{} hours')
+                    WHERE created_at >= ?
                     GROUP BY strftime('%Y-%m-%d %H:00:00', created_at)
                     ORDER BY hour
-                '''.format(hours))
+                ''', (self._cutoff(hours),))
                 
-                columns = [description[0] for description in cursor.description]
-                data = [dict(zip(columns, row)) for row in cursor.fetchall()]
+                data = [dict(row) for row in cursor.fetchall()]
                 
                 logger.info(f"Retrieved alert count data for {len(data)} hours")
                 return data
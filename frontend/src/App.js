@@ -10,6 +10,10 @@ axios.defaults.baseURL = API_BASE_URL;
 
 function App() {
   const [alerts, setAlerts] = useState([]);
+  // Counts over every stored alert; the alerts list only holds the newest page
+  const [alertTotals, setAlertTotals] = useState({ total: 0, threat_breakdown: {} });
+  // Cursor for the next, older page of alerts; null once every alert is listed
+  const [nextCursor, setNextCursor] = useState(null);
   const [chartData, setChartData] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
@@ -38,6 +42,11 @@ function App() {
       const response = await axios.get('/api/alerts');
       if (response.data.success) {
         setAlerts(response.data.alerts);
+        setNextCursor(response.data.next_cursor);
+        setAlertTotals({
+          total: response.data.total,
+          threat_breakdown: response.data.threat_breakdown
+        });
       } else {
         setError('Failed to fetch alerts');
       }
@@ -49,6 +58,31 @@ function App() {
     }
   };
 
+  // Append the next, older page of alerts to the list
+  const loadMoreAlerts = async () => {
+    if (nextCursor === null) {
+      return;
+    }
+
+    try {
+      setLoading(true);
+      setError(null);
+      
+      const response = await axios.get('/api/alerts', { params: { before: nextCursor } });
+      if (response.data.success) {
+        setAlerts((loaded) => [...loaded, ...response.data.alerts]);
+        setNextCursor(response.data.next_cursor);
+      } else {
+        setError('Failed to fetch alerts');
+      }
+    } catch (err) {
+      setError('Error connecting to server. Please ensure the backend is running.');
+      console.error('Error fetching more alerts:', err);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   // Fetch alert statistics for charts
   const fetchStats = async () => {
     try {
@@ -126,6 +160,8 @@ function App() {
         
         if (response.data.success) {
           setAlerts([]);
+          setNextCursor(null);
+          setAlertTotals({ total: 0, threat_breakdown: {} });
           setChartData([]);
           setStats({});
           alert('All alerts cleared successfully');
@@ -191,7 +227,7 @@ function App() {
               {/* Stats Display */}
               <div className="hidden sm:flex items-center space-x-4 text-sm font-mono">
                 <div className="text-center">
-                  <div className="text-cyber-blue font-bold">{alerts.length}</div>
+                  <div className="text-cyber-blue font-bold">{alertTotals.total}</div>
                   <div className="text-gray-400">Total Alerts</div>
                 </div>
                 <div className="text-center">
@@ -291,10 +327,17 @@ function App() {
                 </svg>
                 Security Alerts
                 <span className="ml-2 text-sm bg-red-600 text-white px-2 py-1 rounded-full">
-                  {alerts.length}
+                  {alertTotals.total}
                 </span>
               </h2>
-              <AlertTable alerts={alerts} loading={loading} />
+              <AlertTable
+                alerts={alerts}
+                loading={loading}
+                total={alertTotals.total}
+                threatCounts={alertTotals.threat_breakdown}
+                hasMore={nextCursor !== null}
+                onLoadMore={loadMoreAlerts}
+              />
             </div>
           </div>
         </div>
@@ -1,6 +1,6 @@
 import React from 'react';
 
-const AlertTable = ({ alerts, loading }) => {
+const AlertTable = ({ alerts, loading, total, threatCounts = {}, hasMore = false, onLoadMore }) => {
   // Function to get threat type badge styling
   const getThreatBadgeClass = (threatType) => {
     const baseClass = 'px-2 py-1 text-xs font-medium rounded-full ';
@@ -150,23 +150,35 @@ const AlertTable = ({ alerts, loading }) => {
       <div className="mt-4 p-4 bg-cyber-gray rounded-lg border border-gray-600">
         <div className="flex justify-between items-center text-sm text-gray-400">
           <span>
-            Showing {alerts.length} alert{alerts.length !== 1 ? 's' : ''}
+            Showing {alerts.length} of {total} alert{total !== 1 ? 's' : ''}
           </span>
           <div className="flex space-x-4">
             <span>
-              Critical: {alerts.filter(a => a.threat_type === 'High Frequency Connection').length}
+              Critical: {threatCounts['High Frequency Connection'] || 0}
             </span>
             <span>
-              High: {alerts.filter(a => a.threat_type === 'Suspicious Port').length}
+              High: {threatCounts['Suspicious Port'] || 0}
             </span>
             <span>
-              Medium: {alerts.filter(a => a.threat_type === 'Large Packet').length}
+              Medium: {threatCounts['Large Packet'] || 0}
             </span>
             <span>
-              Low: {alerts.filter(a => a.threat_type === 'Unusual Protocol').length}
+              Low: {threatCounts['Unusual Protocol'] || 0}
             </span>
           </div>
         </div>
+        
+        {hasMore && (
+          <div className="mt-4 text-center">
+            <button
+              onClick={onLoadMore}
+              className="bg-gray-700 hover:bg-gray-600 text-white font-medium py-2 px-4 rounded-lg transition-all duration-300"
+              disabled={loading}
+            >
+              {loading ? 'Loading...' : 'Load more'}
+            </button>
+          </div>
+        )}
       </div>
     </div>
   );
@@ -0,0 +1,59 @@
+"""
+Console output and file helpers shared by the project scripts.
+"""
+
+import io
+import sys
+import threading
+
+COLORS = {
+    "INFO": "\033[1;34m",
+    "SUCCESS": "\033[1;32m",
+    "ERROR": "\033[1;31m",
+    "WARNING": "\033[1;33m"
+}
+RESET = "\033[0m"
+
+# Output is buffered per thread and reaches stdout one whole section at a time,
+# so sections produced concurrently never interleave their lines
+_OUTPUT = threading.local()
+_STDOUT_LOCK = threading.Lock()
+
+def _buffer():
+    if not hasattr(_OUTPUT, "buffer"):
+        _OUTPUT.buffer = io.StringIO()
+    return _OUTPUT.buffer
+
+def write_block(lines):
+    """Add several lines to the current thread's output buffer."""
+    _buffer().write("".join(f"{line}\n" for line in lines))
+
+def flush_output():
+    """Write the current thread's buffered output to stdout in one call."""
+    buffer = _buffer()
+    text = buffer.getvalue()
+    if text:
+        buffer.seek(0)
+        buffer.truncate()
+        with _STDOUT_LOCK:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+def run_section(func, *args):
+    """Run one check and write its whole section to stdout once it finishes."""
+    try:
+        return func(*args)
+    finally:
+        flush_output()
+
+def count_lines(path):
+    """Count lines in a file by scanning raw bytes block by block."""
+    count = 0
+    last_byte = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            count += block.count(b"\n")
+            last_byte = block[-1:]
+
+    # A final line without a trailing newline still counts
+    return count + (last_byte != b"\n")
@@ -2,41 +2,65 @@
 """
 End-to-End Test Script for Intrusion Detection Dashboard
 This script demonstrates and tests all major functionality.
+
+Run it directly (python scripts/test_e2e.py). The checks report pass/fail
+instead of asserting, so they are named check_* to keep pytest from
+collecting them as tests that would always pass.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import time
 import csv
 import os
-from datetime import datetime
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from _console import COLORS, RESET, write_block, flush_output, run_section, count_lines
 
 # Configuration
 BACKEND_URL = "http://localhost:5000"
 FRONTEND_URL = "http://localhost:3000"
 TEST_CSV_PATH = "backend/network_logs.csv"
 
+# (connect, read) seconds: a dead localhost server fails fast, a slow response still gets time
+TIMEOUT = (0.5, 4.5)
+
+# Import the analyzer and build its rule tables once, not on every threat detection run
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'backend'))
+try:
+    from analyzer import NetworkAnalyzer
+    _ANALYZER = NetworkAnalyzer()
+    _ANALYZER_IMPORT_ERROR = None
+except ImportError as e:
+    _ANALYZER = None
+    _ANALYZER_IMPORT_ERROR = e
+
+# One pooled keep-alive session shared by every HTTP probe
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
+# Text around the timestamp is built once per status; only the time changes per print
+_PREFIXES = {status: (f"{color}[", f"][{status}]{RESET}") for status, color in COLORS.items()}
+
+def format_status(message, status="INFO"):
+    before, after = _PREFIXES.get(status) or ("[", f"][{status}]{RESET}")
+    return f"{before}{time.strftime('%H:%M:%S')}{after} {message}"
+
 def print_header(title):
-    print(f"\n{'='*60}")
-    print(f"🔍 {title}")
-    print(f"{'='*60}")
+    # A new header closes the previous section
+    flush_output()
+    write_block(["", "=" * 60, f"🔍 {title}", "=" * 60])
 
 def print_status(message, status="INFO"):
-    colors = {
-        "INFO": "\033[1;34m",
-        "SUCCESS": "\033[1;32m", 
-        "ERROR": "\033[1;31m",
-        "WARNING": "\033[1;33m"
-    }
-    reset = "\033[0m"
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    print(f"{colors.get(status, '')}[{timestamp}][{status}]{reset} {message}")
+    write_block([format_status(message, status)])
 
-def test_backend_health():
+def check_backend_health():
     """Test if backend is running and healthy."""
     print_header("Backend Health Check")
     try:
-        response = requests.get(f"{BACKEND_URL}/api/health", timeout=5)
+        response = SESSION.get(f"{BACKEND_URL}/api/health", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             print_status(f"Backend is healthy: {data['service']}", "SUCCESS")
@@ -49,11 +73,11 @@ def test_backend_health():
         print_status(f"Backend connection failed: {e}", "ERROR")
         return False
 
-def test_frontend_accessibility():
+def check_frontend_accessibility():
     """Test if frontend is accessible."""
     print_header("Frontend Accessibility Check")
     try:
-        response = requests.get(FRONTEND_URL, timeout=5)
+        response = SESSION.get(FRONTEND_URL, timeout=TIMEOUT)
         if response.status_code == 200:
             print_status("Frontend is accessible", "SUCCESS")
             print_status(f"Content length: {len(response.content)} bytes", "INFO")
@@ -65,11 +89,11 @@ def test_frontend_accessibility():
         print_status(f"Frontend connection failed: {e}", "ERROR")
         return False
 
-def test_alerts_api():
+def check_alerts_api():
     """Test the alerts API endpoint."""
     print_header("Alerts API Test")
     try:
-        response = requests.get(f"{BACKEND_URL}/api/alerts", timeout=5)
+        response = SESSION.get(f"{BACKEND_URL}/api/alerts", timeout=TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             print_status(f"Alerts retrieved successfully", "SUCCESS")
@@ -80,7 +104,7 @@ def test_alerts_api():
             if data['alerts'] and len(data['alerts']) > 0:
                 print_status("Sample alerts:", "INFO")
                 for i, alert in enumerate(data['alerts'][:3]):  # Show first 3
-                    print(f"  {i+1}. {alert['alert_type']} - {alert['severity']} - {alert['source_ip']}")
+                    write_block([f"  {i+1}. {alert['alert_type']} - {alert['severity']} - {alert['source_ip']}"])
             else:
                 print_status("No alerts found in database", "WARNING")
             return True
@@ -91,55 +115,49 @@ def test_alerts_api():
         print_status(f"Alerts API failed: {e}", "ERROR")
         return False
 
-def test_file_analysis():
-    """Test file upload and analysis functionality."""
-    print_header("File Analysis Test")
+def preview_test_csv():
+    """Print the sample CSV's size and headers (only with --verbose)."""
+    print_header("Test CSV Preview")
     
     if not os.path.exists(TEST_CSV_PATH):
         print_status(f"Test CSV file not found: {TEST_CSV_PATH}", "ERROR")
-        return False
+        return
+    
+    # Read only the header and count rows in 1 MiB blocks
+    with open(TEST_CSV_PATH, 'r') as f:
+        headers = next(csv.reader(f), [])
+    row_count = count_lines(TEST_CSV_PATH)
+    print_status(f"Test file contains {row_count} rows", "INFO")
+    if row_count > 1:
+        print_status(f"Headers: {', '.join(headers)}", "INFO")
+
+def check_file_analysis():
+    """Test that the file analysis endpoint is available."""
+    print_header("File Analysis Test")
     
     try:
-        # Read a few lines from the CSV to show what we're testing with
-        with open(TEST_CSV_PATH, 'r') as f:
-            reader = csv.reader(f)
-            lines = list(reader)
-            print_status(f"Test file contains {len(lines)} rows", "INFO")
-            if len(lines) > 1:
-                print_status(f"Headers: {', '.join(lines[0])}", "INFO")
-        
-        # Attempt file upload (this might fail due to multipart complexity in requests)
-        print_status("File analysis endpoint exists (upload test would require form data)", "INFO")
-        
-        # Test the endpoint exists
-        try:
-            # This will likely return an error about no file, but confirms the endpoint exists
-            response = requests.post(f"{BACKEND_URL}/api/analyze", timeout=5)
-            if "No file uploaded" in response.text:
-                print_status("Analyze endpoint is responding correctly", "SUCCESS")
-                return True
-            else:
-                print_status(f"Unexpected response from analyze endpoint", "WARNING")
-                return False
-        except requests.exceptions.RequestException as e:
-            print_status(f"Analyze endpoint test failed: {e}", "ERROR")
+        # The route only accepts POST uploads, so a bodyless HEAD gets 405 if it exists and 404 if not
+        response = SESSION.head(f"{BACKEND_URL}/api/analyze", timeout=TIMEOUT)
+        if response.status_code in (200, 400, 405):
+            print_status("Analyze endpoint is responding correctly", "SUCCESS")
+            return True
+        else:
+            print_status(f"Unexpected response from analyze endpoint: HTTP {response.status_code}", "WARNING")
             return False
-            
-    except Exception as e:
-        print_status(f"File analysis test failed: {e}", "ERROR")
+    except requests.exceptions.RequestException as e:
+        print_status(f"Analyze endpoint test failed: {e}", "ERROR")
         return False
 
-def test_threat_detection():
+def check_threat_detection():
     """Test threat detection rules by examining the analyzer."""
     print_header("Threat Detection Rules Test")
     
+    if _ANALYZER is None:
+        print_status(f"Could not import analyzer: {_ANALYZER_IMPORT_ERROR}", "ERROR")
+        return False
+    
     try:
-        # Import the analyzer to test detection rules
-        import sys
-        sys.path.append('backend')
-        from analyzer import NetworkAnalyzer
-        
-        analyzer = NetworkAnalyzer()
+        analyzer = _ANALYZER
         print_status("NetworkAnalyzer imported successfully", "SUCCESS")
         
         # Test with sample data
@@ -176,9 +194,6 @@ def test_threat_detection():
         
         return True
         
-    except ImportError as e:
-        print_status(f"Could not import analyzer: {e}", "ERROR")
-        return False
     except Exception as e:
         print_status(f"Threat detection test failed: {e}", "ERROR")
         return False
@@ -203,8 +218,7 @@ def display_project_summary():
     ]
     
     print_status("Implemented Features:", "INFO")
-    for feature in features:
-        print(f"  {feature}")
+    write_block(f"  {feature}" for feature in features)
     
     print_status("\nTechnology Stack:", "INFO")
     tech_stack = [
@@ -215,35 +229,61 @@ def display_project_summary():
         "Deployment: npm/pip + Windows installer"
     ]
     
-    for tech in tech_stack:
-        print(f"  📋 {tech}")
+    write_block(f"  📋 {tech}" for tech in tech_stack)
 
 def main():
     """Run all tests and display results."""
     print_header("Intrusion Detection Dashboard - End-to-End Test")
     print_status("Starting comprehensive system test...", "INFO")
     
-    # Run all tests
+    if "--verbose" in sys.argv[1:]:
+        preview_test_csv()
+    
+    # Run all tests; each entry lists the tests it depends on
     tests = [
-        ("Backend Health", test_backend_health),
-        ("Frontend Access", test_frontend_accessibility), 
-        ("Alerts API", test_alerts_api),
-        ("File Analysis", test_file_analysis),
-        ("Threat Detection", test_threat_detection)
+        ("Backend Health", check_backend_health, []),
+        ("Frontend Access", check_frontend_accessibility, []), 
+        ("Alerts API", check_alerts_api, ["Backend Health"]),
+        ("File Analysis", check_file_analysis, ["Backend Health"]),
+        ("Threat Detection", check_threat_detection, [])
     ]
     
-    results = {}
-    for test_name, test_func in tests:
-        print_status(f"Running {test_name} test...", "INFO")
-        results[test_name] = test_func()
+    # Tests mostly wait on the network, so run each one as soon as its dependencies pass
+    # and skip it (result None) without any requests if one of them did not
+    print_status(f"Running {len(tests)} tests concurrently...", "INFO")
+    flush_output()
+    pending = {test_name: (test_func, deps) for test_name, test_func, deps in tests}
+    running = {}
+    finished = {}
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        while pending or running:
+            ready = [name for name, (_, deps) in pending.items() if all(dep in finished for dep in deps)]
+            for test_name in ready:
+                test_func, deps = pending.pop(test_name)
+                if all(finished[dep] for dep in deps):
+                    running[executor.submit(run_section, test_func)] = test_name
+                else:
+                    print_status(f"Skipping {test_name}: {', '.join(deps)} did not pass", "WARNING")
+                    finished[test_name] = None
+            
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished[running.pop(future)] = future.result()
+    
+    # Report in the declared order rather than completion order
+    results = {test_name: finished[test_name] for test_name, _, _ in tests}
     
     # Display results summary
     print_header("Test Results Summary")
     
-    passed = sum(results.values())
+    passed = sum(1 for result in results.values() if result)
     total = len(results)
     
     for test_name, result in results.items():
+        if result is None:
+            print_status(f"⏭️  {test_name} (skipped)", "WARNING")
+            continue
         status = "SUCCESS" if result else "ERROR"
         icon = "✅" if result else "❌"
         print_status(f"{icon} {test_name}", status)
@@ -268,8 +308,12 @@ def main():
         "5. 📖 Read BUILD_GUIDE.md for distribution instructions"
     ]
     
-    for step in next_steps:
-        print_status(step, "INFO")
+    write_block(format_status(step, "INFO") for step in next_steps)
+    
+    SESSION.close()
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        flush_output()
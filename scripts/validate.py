@@ -8,17 +8,35 @@ import os
 import sys
 import json
 import csv
+import re
 from pathlib import Path
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; validation may run before backend dependencies are installed
+    json_loads = json.loads
+
+from _console import COLORS, RESET, write_block, flush_output, run_section, count_lines
+
+PACKAGE_JSON_PATH = "frontend/package.json"
+
+# Leading project name of a requirements.txt line; comments and blank lines don't match
+REQUIREMENT_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+# Colored status prefixes are built once instead of on every print
+_PREFIXES = {status: f"{color}[{status}]{RESET}" for status, color in COLORS.items()}
+
 def print_status(message, status="INFO"):
-    colors = {
-        "INFO": "\033[1;34m",
-        "SUCCESS": "\033[1;32m", 
-        "ERROR": "\033[1;31m",
-        "WARNING": "\033[1;33m"
-    }
-    reset = "\033[0m"
-    print(f"{colors.get(status, '')}[{status}]{reset} {message}")
+    prefix = _PREFIXES.get(status) or f"[{status}]{RESET}"
+    write_block([f"{prefix} {message}"])
+
+def list_directory(path):
+    """Return the set of entry names in a directory, or an empty set if it is missing."""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
 
 def validate_file_structure():
     """Validate that all required files and directories exist."""
@@ -54,20 +72,22 @@ def validate_file_structure():
         ]
     }
     
-    missing_files = []
     project_root = Path(".")
+    missing_dirs = [directory for directory in required_structure if not (project_root / directory).exists()]
+    expected = [
+        f"{directory}{file}"
+        for directory, files in required_structure.items() if directory not in missing_dirs
+        for file in files
+    ]
     
-    for directory, files in required_structure.items():
-        dir_path = project_root / directory
-        
-        if not dir_path.exists():
-            missing_files.append(directory)
-            continue
-            
-        for file in files:
-            file_path = project_root / directory / file
-            if not file_path.exists():
-                missing_files.append(f"{directory}{file}")
+    # List each parent directory once, then find everything missing with one set difference
+    present = set()
+    # Paths are compared with "/" separators on every OS, matching required_structure
+    for parent in {path.rpartition("/")[0] for path in expected}:
+        present |= {f"{parent}/{name}" for name in list_directory(project_root / parent)}
+    
+    missing_paths = set(expected) - present
+    missing_files = missing_dirs + [path for path in expected if path in missing_paths]
     
     if missing_files:
         print_status(f"Missing files/directories: {', '.join(missing_files)}", "ERROR")
@@ -81,15 +101,16 @@ def validate_backend_dependencies():
     print_status("Validating backend dependencies...")
     
     try:
+        # Parse package names once so "flask" is not satisfied by "flask-cors"
         with open("backend/requirements.txt", "r") as f:
-            requirements = f.read().lower()
+            requirements = {
+                match.group(0).lower().replace("_", "-")
+                for match in (REQUIREMENT_NAME.match(line.strip()) for line in f)
+                if match
+            }
         
         required_packages = ["flask", "pandas", "flask-cors"]
-        missing_packages = []
-        
-        for package in required_packages:
-            if package not in requirements:
-                missing_packages.append(package)
+        missing_packages = [package for package in required_packages if package not in requirements]
         
         if missing_packages:
             print_status(f"Missing required packages: {', '.join(missing_packages)}", "ERROR")
@@ -102,32 +123,37 @@ def validate_backend_dependencies():
         print_status("requirements.txt not found", "ERROR")
         return False
 
-def validate_frontend_dependencies():
+def load_package_json():
+    """Read frontend/package.json once so every validator can share the parsed result."""
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so one handler covers both
+        package_data = json_loads(Path(PACKAGE_JSON_PATH).read_bytes())
+        return {"package_json": package_data, "package_json_error": None}
+    except (FileNotFoundError, json.JSONDecodeError) as e:
+        return {"package_json": None, "package_json_error": e}
+
+def validate_frontend_dependencies(ctx):
     """Validate frontend package.json contains necessary packages."""
     print_status("Validating frontend dependencies...")
     
-    try:
-        with open("frontend/package.json", "r") as f:
-            package_data = json.load(f)
-        
-        dependencies = package_data.get("dependencies", {})
-        required_packages = ["react", "axios", "chart.js", "react-chartjs-2"]
-        missing_packages = []
-        
-        for package in required_packages:
-            if package not in dependencies:
-                missing_packages.append(package)
-        
-        if missing_packages:
-            print_status(f"Missing required packages: {', '.join(missing_packages)}", "ERROR")
-            return False
-        else:
-            print_status("All required frontend dependencies found", "SUCCESS")
-            return True
-            
-    except (FileNotFoundError, json.JSONDecodeError) as e:
-        print_status(f"Error reading package.json: {e}", "ERROR")
+    if ctx["package_json_error"] is not None:
+        print_status(f"Error reading package.json: {ctx['package_json_error']}", "ERROR")
         return False
+    
+    dependencies = ctx["package_json"].get("dependencies", {})
+    required_packages = ["react", "axios", "chart.js", "react-chartjs-2"]
+    missing_packages = []
+    
+    for package in required_packages:
+        if package not in dependencies:
+            missing_packages.append(package)
+    
+    if missing_packages:
+        print_status(f"Missing required packages: {', '.join(missing_packages)}", "ERROR")
+        return False
+    else:
+        print_status("All required frontend dependencies found", "SUCCESS")
+        return True
 
 def validate_sample_csv():
     """Validate the sample CSV file has the correct format."""
@@ -138,21 +164,22 @@ def validate_sample_csv():
             reader = csv.DictReader(f)
             required_columns = ["timestamp", "source_ip", "destination_ip", "port", "protocol", "packet_size"]
             
-            # Check if all required columns are present
-            missing_columns = [col for col in required_columns if col not in reader.fieldnames]
+            # Check if all required columns are present (an empty file has no fieldnames)
+            present_columns = set(reader.fieldnames or [])
+            missing_columns = [col for col in required_columns if col not in present_columns]
             
             if missing_columns:
                 print_status(f"Missing CSV columns: {', '.join(missing_columns)}", "ERROR")
                 return False
-            
-            # Check if there are data rows
-            rows = list(reader)
-            if len(rows) < 10:
-                print_status("CSV file should have at least 10 data rows", "WARNING")
-            
-            print_status(f"Sample CSV validated successfully ({len(rows)} rows)", "SUCCESS")
-            return True
-            
+        
+        # Count data rows from raw newline bytes instead of parsing every row
+        row_count = max(count_lines("backend/network_logs.csv") - 1, 0)
+        if row_count < 10:
+            print_status("CSV file should have at least 10 data rows", "WARNING")
+        
+        print_status(f"Sample CSV validated successfully ({row_count} rows)", "SUCCESS")
+        return True
+        
     except FileNotFoundError:
         print_status("Sample CSV file not found", "ERROR")
         return False
@@ -160,19 +187,25 @@ def validate_sample_csv():
         print_status(f"Error reading CSV file: {e}", "ERROR")
         return False
 
-def validate_configuration_files():
+def validate_configuration_files(ctx):
     """Validate configuration files are properly formatted."""
     print_status("Validating configuration files...")
     
     config_files = [
         ("frontend/tailwind.config.js", "Tailwind configuration"),
-        ("frontend/package.json", "Frontend package configuration")
+        (PACKAGE_JSON_PATH, "Frontend package configuration")
     ]
     
     all_valid = True
     
     for file_path, description in config_files:
-        if not Path(file_path).exists():
+        # package.json was already opened by load_package_json
+        if file_path == PACKAGE_JSON_PATH:
+            exists = not isinstance(ctx["package_json_error"], FileNotFoundError)
+        else:
+            exists = Path(file_path).exists()
+        
+        if not exists:
             print_status(f"{description} file missing: {file_path}", "ERROR")
             all_valid = False
         else:
@@ -183,32 +216,40 @@ def validate_configuration_files():
 def main():
     """Main validation function."""
     print_status("🛡️  Intrusion Detection Dashboard - Project Validation")
-    print("=" * 60)
+    write_block(["=" * 60])
     
     # Change to project directory if not already there
     if not Path("README.md").exists():
         print_status("Please run this script from the project root directory", "ERROR")
         sys.exit(1)
     
+    ctx = load_package_json()
+    
     validation_results = [
-        validate_file_structure(),
-        validate_backend_dependencies(),
-        validate_frontend_dependencies(),
-        validate_sample_csv(),
-        validate_configuration_files()
+        run_section(validate_file_structure),
+        run_section(validate_backend_dependencies),
+        run_section(validate_frontend_dependencies, ctx),
+        run_section(validate_sample_csv),
+        run_section(validate_configuration_files, ctx)
     ]
     
-    print("\n" + "=" * 60)
+    write_block(["", "=" * 60])
     
     if all(validation_results):
         print_status("✅ All validations passed! Project is ready for setup.", "SUCCESS")
         print_status("Next steps:", "INFO")
-        print("1. Run the setup script: ./scripts/setup.sh (Linux/Mac) or .\\scripts\\setup.ps1 (Windows)")
-        print("2. Follow the README.md instructions to start the application")
+        write_block([
+            "1. Run the setup script: ./scripts/setup.sh (Linux/Mac) or .\\scripts\\setup.ps1 (Windows)",
+            "2. Follow the README.md instructions to start the application"
+        ])
         return 0
     else:
         print_status("❌ Some validations failed. Please check the errors above.", "ERROR")
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
+    try:
+        exit_code = main()
+    finally:
+        flush_output()
+    sys.exit(exit_code)